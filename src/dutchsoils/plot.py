@@ -71,7 +71,7 @@ def soilprofile(
     Parameters
     ----------
     soilprofile : SoilProfile
-        An object representing the soil profile, expected to provide a `get_data()` method returning a DataFrame with required soil properties.
+        An object representing the soil profile, expected to provide a `get_data_horizons()` method returning a DataFrame with required soil properties.
     which : str, optional
         Which data to plot (default: "all"). Options:
             * "all": Combination of hydraulic, physical, and chemical data.
@@ -2,20 +2,129 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from dataclasses import dataclass, field
+from functools import cache
+from numbers import Integral
 from pathlib import Path
 from warnings import warn
 from xml.etree import ElementTree
 
-from numpy import array, concatenate, diff, ones, searchsorted
+from numpy import (
+    add,
+    array,
+    asarray,
+    clip,
+    concatenate,
+    diff,
+    flatnonzero,
+    lexsort,
+    ndarray,
+    repeat,
+    rint,
+    searchsorted,
+    stack,
+    union1d,
+)
 from pandas import (
+    CategoricalDtype,
     DataFrame,
     read_csv,
 )
-from requests import get as requests_get
+from requests import Session
+from requests.adapters import HTTPAdapter, Retry
 from requests.exceptions import JSONDecodeError
 
 from .plot import soilprofile as plot_soilprofile
 
+# HTTP session for requests to the PDOK WMS
+# The session reuses connections between requests and retries requests if the service is temporarily unavailable
+SESSION_PDOK = Session()
+SESSION_PDOK.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Staring series blocks (2018): topsoils B01-B18 (101-118) and subsoils O01-O18 (201-218)
+# A shared categorical type lets merges on this column join on the integer codes
+STARINGSERIESBLOCK_DTYPE = CategoricalDtype(
+    categories=[*range(101, 119), *range(201, 219)]
+)
+
+# Data types of the columns of the CSV files in the data directory
+# Passing these to read_csv avoids type inference when parsing the files
+CSV_DTYPES = {
+    "BofekClusters": {
+        "normalsoilprofile_id": "int32",
+        "area": "float64",
+        "cluster": "int32",
+        "dominant": "int8",
+    },
+    "BofekClustersNames": {
+        "cluster": "int32",
+        "name": "str",
+    },
+    "SoilHorizons": {
+        "normalsoilprofile_id": "int32",
+        "layernumber": "int64",
+        "faohorizonnotation": "str",
+        "ztop": "float64",
+        "zbottom": "float64",
+        "staringseriesblock": STARINGSERIESBLOCK_DTYPE,
+        "organicmattercontent": "float64",
+        "organicmattercontent10p": "float64",
+        "organicmattercontent90p": "float64",
+        "acidity": "float64",
+        "acidity10p": "float64",
+        "acidity90p": "float64",
+        "cnratio": "int64",
+        "peattype": "str",
+        "calciccontent": "float64",
+        "fedith": "float64",
+        "loamcontent": "int64",
+        "loamcontent10p": "int64",
+        "loamcontent90p": "int64",
+        "lutitecontent": "int64",
+        "lutitecontent10p": "int64",
+        "lutitecontent90p": "int64",
+        "sandmedian": "int64",
+        "sandmedian10p": "int64",
+        "sandmedian90p": "int64",
+        "siltcontent": "int64",
+        "density": "float64",
+    },
+    "SoilProfiles": {
+        "normalsoilprofile_id": "int32",
+        "soilunit": "str",
+        "othersoilname": "str",
+    },
+    "SoilProfiles_MapAreaID": {
+        "maparea_id": "int32",
+        "normalsoilprofile_id": "int32",
+    },
+    "Staringreeks2018": {
+        "staringseriesblock": STARINGSERIESBLOCK_DTYPE,
+        "wcres": "float64",
+        "wcsat": "float64",
+        "vgmalpha": "float64",
+        "vgmnpar": "float64",
+        "vgmlambda": "float64",
+        "ksatfit": "float64",
+    },
+    "StaringreeksNamen2018": {
+        "staringseriesblock": STARINGSERIESBLOCK_DTYPE,
+        "staringblockdescription": "str",
+        "staringblocklabel": "str",
+    },
+}
+
 
 @dataclass
 class SoilProfile:
@@ -68,51 +177,29 @@ class SoilProfile:
                 "Provide exactly one input: soilprofile index, code, or bofek cluster number."
             )
 
-        # Get data
-        bofekclusters = self._get_data_csv(csvfile="BofekClusters")
-        soilprofiles = self._get_data_csv(csvfile="SoilProfiles")
-
         # If index is given as input
         if self.index is not None:
-            self._init_from_index(
-                soilprofiles=soilprofiles, bofekclusters=bofekclusters
-            )
+            self._init_from_index()
         # If soil unit code is given as input
         elif self.code is not None:
-            self._init_from_code(bofekclusters=bofekclusters)
+            self._init_from_code()
         # If bofekcluster is given as input (else conditions since nr of inputs is checked)
         else:
-            self._init_from_bofekcluster(
-                soilprofiles=soilprofiles, bofekclusters=bofekclusters
-            )
-
-        self._set_names(soilprofiles=soilprofiles)
+            self._init_from_bofekcluster()
 
-    def _init_from_index(self, soilprofiles, bofekclusters):
-        """Set attributes SoilProfile based on provided soil profile index.
+        self._set_names()
 
-        Parameters
-        ----------
-        soilprofiles: pandas.DataFrame
-            DataFrame from data/SoilProfiles.csv
-        bofekclusters: pandas.DataFrame
-            DataFrame from data/BofekClusters.csv
-        """
+    def _init_from_index(self):
+        """Set attributes SoilProfile based on provided soil profile index."""
         # Check input
         self._validate_input("index", self.index)
 
         # Set soil code & bofek
-        self._set_bofekcluster(bofekclusters=bofekclusters)
-        self._set_code(soilprofiles=soilprofiles)
+        self._set_bofekcluster()
+        self._set_code()
 
-    def _init_from_code(self, bofekclusters):
-        """Set attributes SoilProfile based on provided soil profile code.
-
-        Parameters
-        ----------
-        bofekclusters: pandas.DataFrame
-            DataFrame from data/BofekClusters.csv
-        """
+    def _init_from_code(self):
+        """Set attributes SoilProfile based on provided soil profile code."""
 
         # Check input
         self._validate_input("code", self.code)
@@ -124,7 +211,7 @@ class SoilProfile:
         if len(indices) == 1:
             # Set soil index & bofek
             self.index = indices[0]
-            self._set_bofekcluster(bofekclusters=bofekclusters)
+            self._set_bofekcluster()
 
         # If multiple indices: raise error
         else:
@@ -135,16 +222,8 @@ class SoilProfile:
             )
             raise ValueError(msg)
 
-    def _init_from_bofekcluster(self, soilprofiles, bofekclusters):
-        """Set attributes SoilProfile based on provided BOFEK cluster.
-
-        Parameters
-        ----------
-        soilprofiles: pandas.DataFrame
-            DataFrame from data/SoilProfiles.csv
-        bofekclusters: pandas.DataFrame
-            DataFrame from data/BofekClusters.csv
-        """
+    def _init_from_bofekcluster(self):
+        """Set attributes SoilProfile based on provided BOFEK cluster."""
 
         # Check input
         self._validate_input("bofekcluster", self.bofekcluster)
@@ -156,68 +235,74 @@ class SoilProfile:
         # If bofekcluster dominance True: find attributes
         elif self.bofekcluster_dominant:
             # Set soil index & code
-            mask = (bofekclusters["cluster"].values == self.bofekcluster) & (
-                bofekclusters["dominant"].values == 1
-            )
-            self.index = bofekclusters.loc[mask, "normalsoilprofile_id"].item()
-            self._set_code(soilprofiles=soilprofiles)
+            row = self._get_lookup("BofekClusters", "cluster", "dominant == 1")[
+                self.bofekcluster
+            ]
+            self.index = row["normalsoilprofile_id"]
+            self._set_code()
         # If not: raise error
         else:
             msg = "To get all soilprofiles corresponding to this BOFEK cluster, use the method from_bofekcluster()."
             raise ValueError(msg)
 
-    def _set_code(self, soilprofiles):
-        """Sets attribute code based on provided soil profile index.
-
-        Parameters
-        ----------
-        soilprofiles: pandas.DataFrame
-            DataFrame from data/SoilProfiles.csv
-        """
+    def _set_code(self):
+        """Sets attribute code based on provided soil profile index."""
 
         # Set soil unit code
-        self.code = soilprofiles.loc[
-            soilprofiles["normalsoilprofile_id"] == self.index, "soilunit"
-        ].values[0]
-
-    def _set_bofekcluster(self, bofekclusters):
-        """Set attributes bofekcluster, bofekcluster_dominant based on provided soil profile index.
+        row = self._get_lookup("SoilProfiles", "normalsoilprofile_id")[self.index]
+        self.code = row["soilunit"]
 
-        Parameters
-        ----------
-        bofekclusters: pandas.DataFrame
-            DataFrame from data/BofekClusters.csv
-        """
+    def _set_bofekcluster(self):
+        """Set attributes bofekcluster, bofekcluster_dominant based on provided soil profile index."""
 
         # Set bofek cluster & dominance
-        row = bofekclusters[bofekclusters["normalsoilprofile_id"] == self.index]
-        self.bofekcluster = row["cluster"].iloc[0].item()
-        self.bofekcluster_dominant = row["dominant"].iloc[0].astype(bool)
+        row = self._get_lookup("BofekClusters", "normalsoilprofile_id")[self.index]
+        self.bofekcluster = row["cluster"]
+        self.bofekcluster_dominant = bool(row["dominant"])
 
-    def _set_names(self, soilprofiles):
-        """Set attributes name and bofekcluster_name based on provided soil profile index.
-
-        Parameters
-        ----------
-        soilprofiles: pandas.DataFrame
-            DataFrame from data/SoilProfiles.csv
-        """
+    def _set_names(self):
+        """Set attributes name and bofekcluster_name based on provided soil profile index."""
 
         # Set name soil
-        self.name = soilprofiles.loc[
-            soilprofiles["normalsoilprofile_id"] == self.index, "othersoilname"
-        ].values[0]
+        row = self._get_lookup("SoilProfiles", "normalsoilprofile_id")[self.index]
+        self.name = row["othersoilname"]
 
         # Set name bofek cluster
-        bofeknames = self._get_data_csv(csvfile="BofekClustersNames")
-        self.bofekcluster_name = bofeknames.loc[
-            bofeknames["cluster"] == self.bofekcluster, "name"
-        ].values[0]
+        row = self._get_lookup("BofekClustersNames", "cluster")[self.bofekcluster]
+        self.bofekcluster_name = row["name"]
+
+    @staticmethod
+    def _preload_data() -> None:
+        """
+        Loads all bundled CSV files, builds the lookup tables used during initialisation and merges the horizon
+        data of each soil profile, so that later calls only hit the caches.
+        """
+        # Parse each CSV file in the data directory
+        for path in sorted((Path(__file__).parent / "data").glob("*.csv")):
+            SoilProfile._get_data_csv(path.stem)
+
+        # Build the lookup tables and row indices
+        SoilProfile._get_lookup("BofekClusters", "normalsoilprofile_id")
+        SoilProfile._get_lookup("BofekClusters", "cluster", "dominant == 1")
+        SoilProfile._get_lookup("BofekClustersNames", "cluster")
+        SoilProfile._get_lookup("SoilProfiles", "normalsoilprofile_id")
+        SoilProfile._get_values("SoilProfiles", "soilunit")
+        SoilProfile._get_data_csv_profiles("SoilHorizons")
+        SoilProfile._get_mapping(
+            "SoilProfiles_MapAreaID", "maparea_id", "normalsoilprofile_id"
+        )
+        SoilProfile._get_index_groups("BofekClusters", "cluster")
+        SoilProfile._get_index_groups("SoilProfiles", "soilunit")
+        SoilProfile._get_cluster_areas()
+
+        # Merge the horizons of each soil profile with the Staring series data
+        for index in SoilProfile._get_data_csv_profiles("SoilHorizons"):
+            SoilProfile._get_data_horizons_all(index)
 
     @staticmethod
     def _get_data_csv(
         csvfile: str,
-        filter_profile: bool = False,
+        index: int | None = None,
     ) -> DataFrame:
         """
         Loads a CSV file from the data directory as a pandas DataFrame.
@@ -226,19 +311,153 @@ class SoilProfile:
         ----------
         csvfile : str
             Name of the CSV file (without extension).
-        filter_profile : bool, optional
-            If True, filters the DataFrame for the current profile index.
+        index : int, optional
+            If given, only the rows of the soil profile with this index are returned.
 
         Returns
         -------
         pandas.DataFrame
         """
+        # Return only the rows of the given soil profile
+        if index is not None:
+            data = SoilProfile._get_data_csv(csvfile)
+            rows = SoilProfile._get_data_csv_profiles(csvfile=csvfile).get(index, [])
+            return data.take(rows).reset_index(drop=True)
+
         # Read data
         path = Path(__file__).parent / "data" / (csvfile + ".csv")
-        data = read_csv(path, skiprows=10)
+        data = SoilProfile._read_csv_cached(path=path, skiprows=10)
 
         return data
 
+    @staticmethod
+    @cache
+    def _get_data_csv_profiles(csvfile: str) -> dict:
+        """
+        Groups the rows of a CSV file from the data directory by soil profile. The result is cached.
+
+        Parameters
+        ----------
+        csvfile : str
+            Name of the CSV file (without extension), which should have the column 'normalsoilprofile_id'.
+
+        Returns
+        -------
+        dict
+            Positional row indices (numpy.ndarray) of each soil profile, with the soil profile index as key.
+        """
+        data = SoilProfile._get_data_csv(csvfile)
+
+        return data.groupby("normalsoilprofile_id", sort=False).indices
+
+    @staticmethod
+    @cache
+    def _read_csv_cached(path: Path, skiprows: int) -> DataFrame:
+        """
+        Reads a CSV file as a pandas DataFrame. Each file is parsed only once, after which the DataFrame is cached.
+        The cached DataFrame is shared between calls and should not be modified in place.
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            Path to the CSV file.
+        skiprows : int
+            Number of header lines to skip.
+
+        Returns
+        -------
+        pandas.DataFrame
+        """
+        # Read categorical columns as their plain values first, since read_csv turns unknown categories into NaN
+        dtypes = CSV_DTYPES.get(path.stem, {})
+        categorical = {
+            col: dtype
+            for col, dtype in dtypes.items()
+            if isinstance(dtype, CategoricalDtype)
+        }
+        plain = {col: dtype.categories.dtype for col, dtype in categorical.items()}
+        data = read_csv(path, skiprows=skiprows, dtype={**dtypes, **plain})
+
+        # Check the values of the categorical columns before converting them
+        for col, dtype in categorical.items():
+            unknown = set(data[col].tolist()) - set(dtype.categories.tolist())
+            if unknown:
+                m = f"Unknown values {sorted(unknown)} in column '{col}' of {path.name}."
+                raise ValueError(m)
+            data[col] = data[col].astype(dtype)
+
+        return data
+
+    @staticmethod
+    @cache
+    def _get_lookup(csvfile: str, key: str, query: str | None = None) -> dict:
+        """
+        Builds a lookup table from a CSV file in the data directory. The table is built once and cached.
+
+        Parameters
+        ----------
+        csvfile : str
+            Name of the CSV file (without extension).
+        key : str
+            Column with the keys of the lookup table. The values in this column should be unique.
+        query : str, optional
+            Query to select rows before building the lookup table, see pandas.DataFrame.query.
+
+        Returns
+        -------
+        dict
+            Row (as dict) for each value in the key column.
+        """
+        data = SoilProfile._get_data_csv(csvfile)
+        if query is not None:
+            data = data.query(query)
+
+        return data.set_index(key, drop=False).to_dict("index")
+
+    @staticmethod
+    @cache
+    def _get_mapping(csvfile: str, key: str, value: str) -> dict:
+        """
+        Returns a mapping from the values in one column of a CSV file from the data directory to the values in
+        another column. The result is cached.
+
+        Parameters
+        ----------
+        csvfile : str
+            Name of the CSV file (without extension).
+        key : str
+            Column with the keys of the mapping. The values in this column should be unique.
+        value : str
+            Column with the values of the mapping.
+
+        Returns
+        -------
+        dict
+        """
+        data = SoilProfile._get_data_csv(csvfile)
+
+        return dict(zip(data[key].tolist(), data[value].tolist()))
+
+    @staticmethod
+    @cache
+    def _get_values(csvfile: str, column: str) -> frozenset:
+        """
+        Returns the unique values of a column of a CSV file from the data directory. The result is cached.
+
+        Parameters
+        ----------
+        csvfile : str
+            Name of the CSV file (without extension).
+        column : str
+            Column name.
+
+        Returns
+        -------
+        frozenset
+            Unique values in the column.
+        """
+        return frozenset(SoilProfile._get_data_csv(csvfile)[column].tolist())
+
     @staticmethod
     def _validate_input(input_type, value):
         """
@@ -246,27 +465,24 @@ class SoilProfile:
         """
 
         if input_type == "bofekcluster":
-            valid = (
-                value in SoilProfile._get_data_csv("BofekClusters")["cluster"].values
-            )
+            existing = SoilProfile._get_index_groups("BofekClusters", "cluster")
             msg = f"Given bofek cluster number '{value}' does not exist."
         elif input_type == "index":
-            valid = (
-                value
-                in SoilProfile._get_data_csv("BofekClusters")[
-                    "normalsoilprofile_id"
-                ].values
-            )
+            existing = SoilProfile._get_lookup("BofekClusters", "normalsoilprofile_id")
             msg = f"Given soilprofile index '{value}' does not exist."
         elif input_type == "code":
-            valid = (
-                value in SoilProfile._get_data_csv("SoilProfiles")["soilunit"].values
-            )
+            existing = SoilProfile._get_values("SoilProfiles", "soilunit")
             msg = f"Given soilprofile code '{value}' does not exist."
         else:
-            valid = False
+            existing = ()
             msg = "Unknown input type."
 
+        # Check membership, unhashable values (e.g. lists or arrays) do not exist either
+        try:
+            valid = value in existing
+        except TypeError:
+            valid = False
+
         if not valid:
             raise ValueError(msg)
         else:
@@ -304,17 +520,62 @@ class SoilProfile:
 
         # Set data csv file and column name for given input
         name_csv = "BofekClusters" if cluster is not None else "SoilProfiles"
-        data = SoilProfile._get_data_csv(name_csv)
         col = "cluster" if cluster is not None else "soilunit"
 
-        # Get indices belonging to this variable
+        # Get indices belonging to this variable from the cached groups
+        groups = SoilProfile._get_index_groups(name_csv, col)
         indices_all = []
         for val in values:
-            indices = list(data.loc[data[col] == val, "normalsoilprofile_id"])
-            indices_all += indices
+            indices_all += groups[val]
 
         return indices_all
 
+    @staticmethod
+    @cache
+    def _get_index_groups(csvfile: str, column: str) -> dict:
+        """
+        Groups the soil profile indices of a CSV file from the data directory by the values of a column.
+        The result is cached.
+
+        Parameters
+        ----------
+        csvfile : str
+            Name of the CSV file (without extension), which should have the column 'normalsoilprofile_id'.
+        column : str
+            Column to group by.
+
+        Returns
+        -------
+        dict
+            List of soil profile indices (in file order) for each value in the column.
+        """
+        data = SoilProfile._get_data_csv(csvfile)
+        indices = data["normalsoilprofile_id"].to_numpy()
+
+        return {
+            value: indices[rows].tolist()
+            for value, rows in data.groupby(column, sort=False).indices.items()
+        }
+
+    @staticmethod
+    @cache
+    def _get_cluster_areas() -> dict:
+        """
+        Returns the total area of each BOFEK cluster. The result is cached.
+
+        Returns
+        -------
+        dict
+            Total area (sum of the areas of its soil profiles) with the BOFEK cluster number as key.
+        """
+        data = SoilProfile._get_data_csv("BofekClusters")
+        area = data["area"].to_numpy()
+
+        return {
+            cluster: float(area[rows].sum())
+            for cluster, rows in data.groupby("cluster", sort=False).indices.items()
+        }
+
     @staticmethod
     def _is_iterable(obj):
         """
@@ -444,7 +705,7 @@ class SoilProfile:
         cls,
         x: float | list | None,
         y: float | list | None,
-        crs: str = "EPSG:28992",
+        crs: str | int = "EPSG:28992",
     ) -> "SoilProfile" | list["SoilProfile"]:
         """
         Create SoilProfile(s) from geographic coordinates using the WMS of PDOK (https://www.pdok.nl/ogc-webservices/-/article/bro-bodemkaart-sgm-).
@@ -457,9 +718,10 @@ class SoilProfile:
             X coordinate(s) (longitude or easting). If a list or array is given, it must have the same length as `y`.
         y : float or list of float
             Y coordinate(s) (latitude or northing). If a list or array is given, it must have the same length as `x`.
-        crs : str, optional
+        crs : str or int, optional
             Coordinate reference system, choose from: `["EPSG:28992", "EPSG:25831", "EPSG:25832", "EPSG:3034", "EPSG:3035",
             "EPSG:3857", "EPSG:4258", "EPSG:4326", "CRS:84"]` (default: "EPSG:28992" (Amersfoort / RD New)).
+            An EPSG code can also be given as an integer, e.g. 4326 for "EPSG:4326".
 
         Returns
         -------
@@ -470,6 +732,9 @@ class SoilProfile:
         # Check if x and y have the same length and right data type
         cls._check_input_location(x, y)
 
+        # Convert EPSG code to the format "EPSG:XXX"
+        crs = cls._format_crs(crs)
+
         # Convert to list if scalar
         is_scalar = not (cls._is_iterable(x) and cls._is_iterable(y))
         xl = [x] if is_scalar else x
@@ -495,6 +760,24 @@ class SoilProfile:
 
         return result[0] if is_scalar else result
 
+    @staticmethod
+    def _format_crs(crs):
+        """
+        Converts an integer EPSG code to the format "EPSG:XXX", other values are returned unchanged.
+
+        Parameters
+        ----------
+        crs : str or int
+            Coordinate reference system.
+
+        Returns
+        -------
+        str
+        """
+        if isinstance(crs, Integral) and not isinstance(crs, bool):
+            return f"EPSG:{int(crs)}"
+        return crs
+
     @classmethod
     def _check_input_location(cls, x, y):
         """
@@ -521,16 +804,16 @@ class SoilProfile:
                 raise ValueError(
                     f"List of X and Y coordinates do not have the same length (x: {len(x)}, y: {len(y)})."
                 )
-            for i, xx in enumerate(x):
-                if not isinstance(xx, (float, int)):
-                    raise ValueError(
-                        f"The {i}th element of the X-coordinates is neither a float or int."
-                    )
-            for j, yy in enumerate(y):
-                if not isinstance(yy, (float, int)):
-                    raise ValueError(
-                        f"The {j}th element of the Y-coordinates is neither a float or int."
-                    )
+            # Check the data type of all coordinates at once
+            # Only if this fails, search for the first element that is neither a float or int
+            for name, coords in (("X", x), ("Y", y)):
+                if cls._is_numeric_array(coords):
+                    continue
+                for i, coord in enumerate(coords):
+                    if not isinstance(coord, (float, int)):
+                        raise ValueError(
+                            f"The {i}th element of the {name}-coordinates is neither a float or int."
+                        )
         else:
             if cls._is_iterable(y):
                 raise ValueError("Y is iterable while X is not.")
@@ -541,6 +824,26 @@ class SoilProfile:
 
         return
 
+    @staticmethod
+    def _is_numeric_array(obj):
+        """
+        Checks if object can be converted to a one-dimensional numpy array of integers or floats.
+
+        Parameters
+        ----------
+        obj : iterable
+            Object to check.
+
+        Returns
+        -------
+        bool
+        """
+        try:
+            arr = asarray(obj)
+        except ValueError:
+            return False
+        return arr.ndim == 1 and arr.dtype.kind in "iuf"
+
     @classmethod
     def _request_mapid(cls, xx, yy, crs):
         """
@@ -565,7 +868,7 @@ class SoilProfile:
         # The bounding box extents from the requested location 1 meter north and east
         # The image consists of 2x2 pixels
         # The pixel value of the lower left pixel is returned
-        r = requests_get(
+        r = SESSION_PDOK.get(
             url="https://service.pdok.nl/bzk/bro-bodemkaart/wms/v1_0",
             params={
                 "request": "getFeatureInfo",
@@ -581,6 +884,7 @@ class SoilProfile:
                 "i": 0,
                 "j": 2,
             },
+            timeout=(3, 10),
         )
         # Raise error for a HTTP error
         # This is not inside a try-except loop because the error should be displayed to the user
@@ -630,18 +934,16 @@ class SoilProfile:
         SoilProfile
             An instance of the SoilProfile class corresponding to the provided map area ID.
         """
-        # Load dataframe relating mapid to soilprofile index
-        df = cls._get_data_csv(csvfile="SoilProfiles_MapAreaID")
+        # Load mapping from mapid to soilprofile index
+        mapping = cls._get_mapping(
+            "SoilProfiles_MapAreaID", "maparea_id", "normalsoilprofile_id"
+        )
 
         # Strip mapid from redudant information
         mapid_short = int(mapid[-5:])
 
         # Get soilprofile index from mapid_short
-        index = (
-            df.loc[df["maparea_id"] == mapid_short, "normalsoilprofile_id"]
-            .values[0]
-            .item()
-        )
+        index = mapping[mapid_short]
 
         # Make SoilProfile object
         return cls.from_index(index=index)
@@ -667,14 +969,13 @@ class SoilProfile:
             If 'which' is not a valid option.
         """
 
-        # Get data
-        data = self._get_data_csv("BofekClusters")
         # Return area of this profile
         if which == "profile":
-            return data.loc[data["normalsoilprofile_id"] == self.index, "area"].iloc[0]
+            row = self._get_lookup("BofekClusters", "normalsoilprofile_id")[self.index]
+            return row["area"]
         # Return total area of the bofek cluster
         elif which == "bofekcluster":
-            return data.loc[data["cluster"] == self.bofekcluster, "area"].sum()
+            return self._get_cluster_areas()[self.bofekcluster]
         # Return ValueError
         else:
             raise ValueError(
@@ -767,13 +1068,6 @@ class SoilProfile:
             ksatfit
                 Fitted hydraulic conductivity at saturation (cm d^-1)
         """
-        # Get data horizons
-        dataall = self._get_data_csv("SoilHorizons")
-
-        # Filter profile
-        mask = dataall["normalsoilprofile_id"] == self.index
-        dataall = dataall.loc[mask].reset_index(drop=True)
-
         # Keep relevant columns
         column_names = [
             "normalsoilprofile_id",
@@ -805,9 +1099,17 @@ class SoilProfile:
             "density",
         ]
 
-        # If only hydraulic data should be returned, keep only horizon depth parameters
+        # Columns added from the Staring series data, without the column they are joined on
+        column_names_staring = [
+            col
+            for csvfile in ["Staringreeks2018", "StaringreeksNamen2018"]
+            for col in self._get_data_csv(csvfile).columns
+            if col != "staringseriesblock"
+        ]
+
+        # If only hydraulic data should be returned, keep only horizon depth parameters and Staring series data
         if which == "hydraulic":
-            columns = column_names[1:6]
+            columns = column_names[1:6] + column_names_staring
         # If only chemical data should be returned, keep only chemical parameters
         elif which == "chemical":
             columns = column_names[1:5] + column_names[6:16]
@@ -816,35 +1118,60 @@ class SoilProfile:
             columns = column_names[1:5] + column_names[16:]
         # Keep all columns except the soilprofile_index
         elif which == "all":
-            columns = column_names[1:]
+            columns = column_names[1:] + column_names_staring
         else:
             raise ValueError(
                 f"Unvalid value for 'which': {which}. Choose between 'all', 'hydraulic', 'physical', 'chemical'."
             )
 
-        # Filter columns
-        datafil = dataall[columns]
-
-        # Add hydraulic data if necessary
-        if which == "hydraulic" or which == "all":
-            # Merge with Staringreeks data
-            # Get Staringreeks data
-            staring = self._get_data_csv("Staringreeks2018")
-            # Join on Staringreeks block
-            datafil = datafil.merge(staring, on="staringseriesblock")
-
-            # Merge with Staringreeks names
-            # Get Staringreeks names
-            staringnames = self._get_data_csv("StaringreeksNamen2018")
-            # Join on Staringreeks block
-            datafil = datafil.merge(staringnames, on="staringseriesblock")
-
-            # Change Staringreeks block name: 1 -> B, 2 -> O
-            datafil = datafil.astype({"staringseriesblock": str})
-            datafil.loc[:, "staringseriesblock"] = [
-                {"1": "B", "2": "O"}.get(str(name)[0]) + str(name)[-2:]
-                for name in datafil["staringseriesblock"]
-            ]
+        # Get all data of the horizons of this profile, including the Staring series data
+        dataall = self._get_data_horizons_all(self.index)
+
+        # Filter columns (this returns a new DataFrame, the cached data is not modified)
+        return dataall[columns]
+
+    @staticmethod
+    @cache
+    def _get_data_horizons_all(index: int) -> DataFrame:
+        """
+        Returns a DataFrame with all soil horizon data of a soil profile, merged with the Staring series data.
+        The result is cached for each soil profile and should not be modified in place.
+
+        Parameters
+        ----------
+        index : int
+            Soil profile index.
+
+        Returns
+        -------
+        pandas.DataFrame
+            See SoilProfile.get_data_horizons(which="all").
+        """
+        # Get data horizons of this profile, without the soilprofile_index
+        datafil = SoilProfile._get_data_csv("SoilHorizons", index=index)
+        datafil = datafil.drop(columns="normalsoilprofile_id")
+
+        # Merge with Staringreeks data
+        # Get Staringreeks data
+        staring = SoilProfile._get_data_csv("Staringreeks2018")
+        # Join on Staringreeks block
+        datafil = datafil.merge(
+            staring, on="staringseriesblock", how="left", sort=False
+        )
+
+        # Merge with Staringreeks names
+        # Get Staringreeks names
+        staringnames = SoilProfile._get_data_csv("StaringreeksNamen2018")
+        # Join on Staringreeks block
+        datafil = datafil.merge(
+            staringnames, on="staringseriesblock", how="left", sort=False
+        )
+
+        # Change Staringreeks block name: 1 -> B, 2 -> O
+        blocks = datafil["staringseriesblock"].astype(str)
+        datafil["staringseriesblock"] = (
+            blocks.str[0].map({"1": "B", "2": "O"}) + blocks.str[-2:]
+        )
 
         return datafil
 
@@ -869,82 +1196,106 @@ class SoilProfile:
             Discretisation information for pySWAP.
         """
 
-        # Get data
-        data = self.get_data_horizons()
+        # Get bottom of the soil physical layers from the cached horizons table of this profile
+        horizons = self._get_data_horizons_all(self.index)
+        # Convert from m to cm, rounding to avoid truncation of inexact floats (e.g. 0.29 * 100 = 28.999...)
+        soillay_zb = rint(horizons["zbottom"].to_numpy() * 100).astype(int)
+
+        depths = array(discretisation_depths)
+        hcomps = array(discretisation_compheights)
+
+        # Check if a compartment height is given for each discretisation depth
+        if len(depths) != len(hcomps) or len(depths) == 0:
+            m = (
+                f"The given compartment depths and compartment heights should be non-empty and have the same length "
+                f"(depths: {len(depths)}, heights: {len(hcomps)})."
+            )
+            raise ValueError(m)
+
+        # Check if the compartment depths and heights are positive
+        if not ((depths > 0).all() and (hcomps > 0).all()):
+            m = f"The given compartment depths {depths} and compartment heights {hcomps} should be positive."
+            raise ValueError(m)
 
         # Check if the depth of each discretisation layer is a natural product of its compartment height
-        check = array(
-            [
-                depth % hcomp
-                for depth, hcomp in zip(
-                    discretisation_depths, discretisation_compheights
-                )
-            ]
-        )
-        if any(check != 0):
+        check = depths % hcomps
+        if check.any():
             idx = check.nonzero()[0]
             m = (
-                f"The given compartment depths {array(discretisation_depths)[idx]}"
+                f"The given compartment depths {depths[idx]}"
                 f" are not a natural product of the given compartment heights "
-                f"{array(discretisation_compheights)[idx]}."
+                f"{hcomps[idx]}."
             )
             raise ValueError(m)
 
-        # Define the height for each compartment
-        comps_h = concatenate(
-            [
-                ones(int(hsublay / hcomp)) * hcomp
-                for hsublay, hcomp in zip(
-                    discretisation_depths, discretisation_compheights
-                )
-            ]
-        )
+        # Build the sublayers from the compartments and soil physical layers
+        isoillay, hcomp, hsublay = self._build_compartments(depths, hcomps, soillay_zb)
 
-        # Define the bottom z for each compartment
-        comps_zb = comps_h.cumsum().astype(int)
+        # Convert to dictionary
+        result = {
+            "ISUBLAY": list(range(1, len(isoillay) + 1)),
+            "ISOILLAY": isoillay.tolist(),
+            "HSUBLAY": hsublay.tolist(),
+            "HCOMP": hcomp.tolist(),
+            "NCOMP": (hsublay // hcomp).tolist(),
+        }
 
-        # Get bottom of the soil physical layers
-        soillay_zb = (array(data["zbottom"]) * 100).astype(int)  # convert from m to cm
+        return result
+
+    @staticmethod
+    def _build_compartments(
+        depths: ndarray, hcomps: ndarray, soillay_zb: ndarray
+    ) -> tuple[ndarray, ndarray, ndarray]:
+        """
+        Divides a soil profile into sublayers of equal compartment height within one soil physical layer.
+
+        Parameters
+        ----------
+        depths : numpy.ndarray
+            Depth of each discretisation layer (cm), each a natural product of its compartment height.
+        hcomps : numpy.ndarray
+            Compartment height of each discretisation layer (cm).
+        soillay_zb : numpy.ndarray
+            Bottom of each soil physical layer (cm), sorted in ascending order.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Soil physical layer number, compartment height and height of each sublayer.
+        """
+
+        # Define the bottom z for each compartment
+        # Repeat each compartment height by the number of compartments in its layer
+        comps_zb = repeat(hcomps, (depths // hcomps).astype(int)).cumsum().astype(int)
 
         # Intersect with the bottom of the soil physical layers
-        comps_zb = array(sorted(set(soillay_zb).union(set(comps_zb))))
+        comps_zb = union1d(soillay_zb, comps_zb)
 
         # Remove values deeper than given depth (sum of discretisation keys)
-        comps_zb = comps_zb[comps_zb <= sum(discretisation_depths)]
+        comps_zb = comps_zb[comps_zb <= depths.sum()]
 
-        # Redefine height compartments
-        comps_h = concatenate([[comps_zb[0]], diff(comps_zb)])
+        # Define height compartments
+        comps_h = concatenate([comps_zb[:1], diff(comps_zb)])
 
         # Define corresponding soil layer for each sublayer
-        comps_soillay = searchsorted(soillay_zb, comps_zb, side="left") + 1
         # Deeper sublayers than the BOFEK profile get same properties as the deepest soil physical layer
-        comps_soillay[comps_soillay > len(soillay_zb)] = len(soillay_zb)
-
-        # Convert to dataframe
-        result = DataFrame(
-            {
-                "ISOILLAY": comps_soillay,
-                "HCOMP": comps_h,
-                "HSUBLAY": comps_h,
-            }
+        comps_soillay = clip(
+            searchsorted(soillay_zb, comps_zb, side="left") + 1, 1, len(soillay_zb)
         )
 
         # Group layers if they have the same soil physical layer and compartment height
-        result = result.groupby(["ISOILLAY", "HCOMP"], as_index=False).sum()
-
-        # Calculate remaining parameters
-        result["ISUBLAY"] = result.index.values + 1
-        result["NCOMP"] = (result["HSUBLAY"].values / result["HCOMP"].values).astype(
-            int
-        )
+        # After sorting on soil layer and compartment height, each group is a run of adjacent compartments
+        order = lexsort((comps_h, comps_soillay))
+        comps_soillay, comps_h = comps_soillay[order], comps_h[order]
+        newrun = (diff(comps_soillay) != 0) | (diff(comps_h) != 0)
+        starts = concatenate([[0], flatnonzero(newrun) + 1])
 
-        # Rearrange columns
-        result = result[["ISUBLAY", "ISOILLAY", "HSUBLAY", "HCOMP", "NCOMP"]]
+        # Calculate parameters of each sublayer
+        isoillay = comps_soillay[starts]
+        hcomp = comps_h[starts]
+        hsublay = add.reduceat(comps_h, starts)
 
-        # Convert to dictionary
-        result = result.to_dict("list")
-
-        return result
+        return isoillay, hcomp, hsublay
 
     def get_swapinput_hydraulicparams(
         self,
@@ -967,8 +1318,8 @@ class SoilProfile:
             Hydraulic parameters for pySWAP.
         """
 
-        # Get data
-        data = self.get_data_horizons(which="all")
+        # Get data (cached and shared between calls, so columns are copied below)
+        data = self._get_data_horizons_all(self.index)
 
         # Define a dictionary
         result = {}
@@ -976,15 +1327,18 @@ class SoilProfile:
         # Add given information or data from the database
         result.update(
             {
-                "ORES": data["wcres"].values,
-                "OSAT": data["wcsat"].values,
-                "ALFA": data["vgmalpha"].values,
-                "NPAR": data["vgmnpar"].values,
-                "KSATFIT": data["ksatfit"].values,
-                "LEXP": data["vgmlambda"].values,
-                "H_ENPR": h_enpr if h_enpr is not None else [0.0] * len(data["wcres"]),
-                "KSATEXM": ksatexm if ksatexm is not None else data["ksatfit"].values,
-                "BDENS": data["density"].values * 1000,  # Convert from g/cm3 to kg/m3
+                "ORES": data["wcres"].to_numpy(copy=True),
+                "OSAT": data["wcsat"].to_numpy(copy=True),
+                "ALFA": data["vgmalpha"].to_numpy(copy=True),
+                "NPAR": data["vgmnpar"].to_numpy(copy=True),
+                "KSATFIT": data["ksatfit"].to_numpy(copy=True),
+                "LEXP": data["vgmlambda"].to_numpy(copy=True),
+                "H_ENPR": h_enpr if h_enpr is not None else [0.0] * len(data),
+                "KSATEXM": ksatexm
+                if ksatexm is not None
+                else data["ksatfit"].to_numpy(copy=True),
+                "BDENS": data["density"].to_numpy()
+                * 1000,  # Convert from g/cm3 to kg/m3
             }
         )
 
@@ -1000,29 +1354,21 @@ class SoilProfile:
             Texture fractions and organic matter for pySWAP.
         """
 
-        # Get data
-        data = self.get_data_horizons(which="all")
+        # Get data (cached and shared between calls, the values are copied by stack below)
+        data = self._get_data_horizons_all(self.index)
 
-        # Define result dictionary
-        result = {}
+        # Get mass percentages
+        psilt = data["siltcontent"].to_numpy()
+        pclay = data["lutitecontent"].to_numpy()
+        orgmat = data["organicmattercontent"].to_numpy()
 
-        # Define PSAND as the remainder after subtracting PSILT and PCLAY
-        psand = -data["siltcontent"].values - data["lutitecontent"].values + 100
-        result.update({"PSAND": psand})
-
-        # Add other information from the database
-        result.update(
-            {
-                "PSILT": data["siltcontent"].values,
-                "PCLAY": data["lutitecontent"].values,
-                "ORGMAT": data["organicmattercontent"].values,
-            }
-        )
+        # Stack the percentages in one array, PSAND is the remainder after subtracting PSILT and PCLAY
+        fractions = stack([100 - psilt - pclay, psilt, pclay, orgmat], dtype=float)
 
         # Convert from percentage to fraction
-        result.update({var: values * 0.01 for var, values in result.items()})
+        fractions *= 0.01
 
-        return result
+        return dict(zip(["PSAND", "PSILT", "PCLAY", "ORGMAT"], fractions))
 
     def get_swapinput_cofani(self) -> list:
         """
@@ -1033,10 +1379,10 @@ class SoilProfile:
         list of float
         """
 
-        # Get data
-        data = self.get_data_horizons()
+        # Count soil physical layers in the cached horizons table of this profile
+        horizons = self._get_data_horizons_all(self.index)
 
-        return [1.0] * len(data.index)
+        return [1.0] * len(horizons)
 
     def plot(self, which: str = "all") -> None:
         """
@@ -0,0 +1,33 @@
+"""Shared fixtures. Tests using them must not rely on side effects of earlier calls on the shared objects."""
+
+import matplotlib
+import pytest
+
+from dutchsoils import SoilProfile
+
+# Render figures without a display
+matplotlib.use("Agg")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def preload_data():
+    """Loads the bundled data once before the first test."""
+    SoilProfile._preload_data()
+
+
+@pytest.fixture(scope="session")
+def sp1001():
+    """Dominant soil profile of BOFEK cluster 1001 (shared between tests, do not modify)."""
+    return SoilProfile(bofekcluster=1001, bofekcluster_dominant=True)
+
+
+@pytest.fixture(scope="session")
+def sp1008():
+    """Dominant soil profile of BOFEK cluster 1008 (shared between tests, do not modify)."""
+    return SoilProfile(bofekcluster=1008, bofekcluster_dominant=True)
+
+
+@pytest.fixture(scope="session")
+def sp3015():
+    """Dominant soil profile of BOFEK cluster 3015 (shared between tests, do not modify)."""
+    return SoilProfile(bofekcluster=3015, bofekcluster_dominant=True)
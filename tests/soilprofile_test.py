@@ -1,13 +1,55 @@
-import warnings
+import re
+from functools import cache
+from importlib.resources import files
 from pathlib import Path
 
+import matplotlib.pyplot as plt
 import pytest
-from numpy import array
+from numpy import allclose, array, asarray, int64
+from numpy.testing import assert_array_equal
 from pandas import DataFrame, read_csv
 from pandas.testing import assert_frame_equal
 
 from dutchsoils import SoilProfile
 
+# Expected error messages used by several tests
+ERR_ONE_INPUT = re.compile(
+    re.escape(
+        "Provide exactly one input: soilprofile index, code, or bofek cluster number."
+    )
+)
+ERR_INDEX_999999 = re.compile(
+    re.escape("Given soilprofile index '999999' does not exist.")
+)
+ERR_CODE_TEST = re.compile(re.escape("Given soilprofile code 'test' does not exist."))
+ERR_BOFEK_999999 = re.compile(
+    re.escape("Given bofek cluster number '999999' does not exist.")
+)
+
+# Directory with the reference data
+DATA_DIR = Path(__file__).parent / "data"
+
+
+@cache
+def _read_reference_cached(filename: str) -> DataFrame:
+    """Reads a reference CSV file from the test data directory once per session."""
+    return read_csv(DATA_DIR / filename)
+
+
+def read_reference(filename: str) -> DataFrame:
+    """Returns a copy of a cached reference DataFrame, which tests may modify."""
+    return _read_reference_cached(filename).copy()
+
+
+def assert_swapinput_equal(result: dict, ref: DataFrame) -> None:
+    """Checks a pySWAP input dictionary column by column against a reference DataFrame."""
+    assert list(result) == list(ref.columns)
+    for col in ref.columns:
+        values = asarray(result[col])
+        values_ref = ref[col].to_numpy()
+        assert values.shape == values_ref.shape, col
+        assert allclose(values, values_ref, rtol=1e-5, atol=1e-8, equal_nan=True), col
+
 
 def test_initialisation_soilprofile():
     # CORRECT INPUT
@@ -26,96 +68,111 @@ def test_initialisation_soilprofile():
 
     # WRONG INPUT
     # Test with incorrect input: no input
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_ONE_INPUT):
         SoilProfile()
-    assert (
-        "Provide exactly one input: soilprofile index, code, or bofek cluster number."
-        in str(exc_info.value)
-    )
 
     # Test with incorrect input: too much input
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_ONE_INPUT):
         SoilProfile(bofekcluster=1001, index=1001)
-    assert (
-        "Provide exactly one input: soilprofile index, code, or bofek cluster number."
-        in str(exc_info.value)
-    )
 
     # Test with incorrect input: wrong soil id
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_INDEX_999999):
         SoilProfile(index=999999)
-    assert "Given soilprofile index '999999' does not exist." in str(exc_info.value)
 
     # Test with incorrect input: wrong soil code
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_CODE_TEST):
         SoilProfile(code="test")
-    assert "Given soilprofile code 'test' does not exist." in str(exc_info.value)
     # Test with incorrect input: soil code has more corresponding soilprofiles
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "Specify the index to get one of them or use the method from_code() to get all."
+        ),
+    ):
         SoilProfile(code="Hn21")
-    assert (
-        "Specify the index to get one of them or use the method from_code() to get all."
-        in str(exc_info.value)
-    )
 
     # Test with incorrect input: wrong cluster number
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_BOFEK_999999):
         SoilProfile(bofekcluster=999999)
-    assert "Given bofek cluster number '999999' does not exist." in str(exc_info.value)
     # Test with incorrect input: bofek cluster dominance not specified
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Please specify the attribute bofekcluster_dominant."),
+    ):
         SoilProfile(bofekcluster=3015)
-    assert "Please specify the attribute bofekcluster_dominant." in str(exc_info.value)
     # Test with incorrect input: bofek cluster dominance False -> use from_bofekcluster() instead
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "To get all soilprofiles corresponding to this BOFEK cluster, use the method from_bofekcluster()."
+        ),
+    ):
         SoilProfile(bofekcluster=3015, bofekcluster_dominant=False)
-    assert (
-        "To get all soilprofiles corresponding to this BOFEK cluster, use the method from_bofekcluster()."
-        in str(exc_info.value)
-    )
 
 
 def test_from_bofekcluster():
-    # Test with correct input
+    # Test with correct input: single cluster returns a single soil profile
     sp = SoilProfile.from_bofekcluster(3012)
+    assert isinstance(sp, SoilProfile)
     assert sp.bofekcluster_name == "Zwak lemige enkeerdgronden"
-    sps = SoilProfile.from_bofekcluster([3012, 1008])
-    assert (
-        sps[1].bofekcluster_name
-        == "Dunne veengronden: kleibovengrond op veen op zand I"
-    )
 
-    # Test with correct input: non dominant profiles
-    sps = list(SoilProfile.from_bofekcluster(4001, dominant=False))
-    indices = [sp.index for sp in sps]
-    ind_corr = [15520, 15530, 16150]
-    assert [i in ind_corr for i in indices] == [True] * 3
+    # Test with correct input: multiple clusters
+    sps = SoilProfile.from_bofekcluster([3012, 1008])
+    assert [sp.bofekcluster_name for sp in sps] == [
+        "Zwak lemige enkeerdgronden",
+        "Dunne veengronden: kleibovengrond op veen op zand I",
+    ]
 
     # Test with correct input: non dominant profiles
-    sps = list(SoilProfile.from_bofekcluster([4001, 3018], dominant=False))
+    sps = SoilProfile.from_bofekcluster([4001, 3018], dominant=False)
     indices = [sp.index for sp in sps]
     ind_corr = [15520, 15530, 16150, 8101, 8041]
-    assert [i in ind_corr for i in indices] == [True] * 5
-
-    # Test with incorrect input: wrong bofek
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_bofekcluster(999999)
-    assert "Given bofek cluster number '999999' does not exist." in str(exc_info.value)
-
-    # Test with incorrect input: wrong bofek, non-dominant False
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_bofekcluster(999999, dominant=False)
-    assert "Given bofek cluster number '999999' does not exist." in str(exc_info.value)
+    assert set(indices) == set(ind_corr)
 
-    # Test with incorrect input: second element is wrong
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_bofekcluster([3012, 999999])
-    assert "Given bofek cluster number '999999' does not exist." in str(exc_info.value)
-
-    # Test with incorrect input: second element is wrong, non-dominant False
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_bofekcluster([3012, 999999], dominant=False)
-    assert "Given bofek cluster number '999999' does not exist." in str(exc_info.value)
+    # Profiles of a single cluster
+    indices = [sp.index for sp in sps if sp.bofekcluster == 4001]
+    ind_corr = [15520, 15530, 16150]
+    assert set(indices) == set(ind_corr)
+
+
+@pytest.mark.parametrize(
+    "cluster",
+    [999999, [3012, 999999]],
+    ids=["wrong bofek", "second element is wrong"],
+)
+@pytest.mark.parametrize("dominant", [True, False])
+def test_from_bofekcluster_wrong_input(cluster, dominant):
+    # Test with incorrect input
+    with pytest.raises(ValueError, match=ERR_BOFEK_999999):
+        SoilProfile.from_bofekcluster(cluster, dominant=dominant)
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        ({"index": [1001, 1002]}, "soilprofile index '[1001, 1002]'"),
+        ({"index": array([1001])}, "soilprofile index '[1001]'"),
+        ({"code": ["Hn21"]}, "soilprofile code '['Hn21']'"),
+        (
+            {"bofekcluster": [1001], "bofekcluster_dominant": True},
+            "bofek cluster number '[1001]'",
+        ),
+    ],
+    ids=["index list", "index array", "code list", "bofek list"],
+)
+def test_initialisation_unhashable_input(kwargs, msg):
+    # Test with incorrect input: unhashable values are reported as not existing
+    with pytest.raises(ValueError, match=re.escape(f"Given {msg} does not exist.")):
+        SoilProfile(**kwargs)
+
+
+def test_from_bofekcluster_unhashable_input():
+    # Test with incorrect input: nested list of clusters
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Given bofek cluster number '[1001]' does not exist."),
+    ):
+        SoilProfile.from_bofekcluster([[1001]])
 
 
 def test_from_index():
@@ -126,14 +183,12 @@ def test_from_index():
     assert sps[1].name == "Holtpodzolgronden; grof zand"
 
     # Test with incorrect input: wrong index
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_INDEX_999999):
         SoilProfile.from_index(999999)
-    assert "Given soilprofile index '999999' does not exist." in str(exc_info.value)
 
     # Test with incorrect input: second element is wrong
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_INDEX_999999):
         SoilProfile.from_index([3030, 999999])
-    assert "Given soilprofile index '999999' does not exist." in str(exc_info.value)
 
 
 def test_from_code():
@@ -144,359 +199,366 @@ def test_from_code():
     assert [10186, 90110186, 90210186, 9018040, 9028040] == [sp.index for sp in sps]
 
     # Test with incorrect input: wrong index
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_CODE_TEST):
         SoilProfile.from_code("test")
-    assert "Given soilprofile code 'test' does not exist." in str(exc_info.value)
 
     # Test with incorrect input: second element is wrong
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=ERR_CODE_TEST):
         SoilProfile.from_code(["Zn21", "test"])
-    assert "Given soilprofile code 'test' does not exist." in str(exc_info.value)
 
 
-def test_from_location():
-    # Test with correct input: single location
-    sp = SoilProfile.from_location(
-        x=200234,
-        y=507675,
-    )
-    assert sp.index == 1230
-
-    # Test with correct input: single location, other CRS
-    sp = SoilProfile.from_location(
-        x=51.350794,
-        y=3.574202,
-        crs="EPSG:4326",
-    )
-    assert sp.index == 90115320
-
-    # Test with location without soil profile: x=0,y=0
-    with warnings.catch_warnings(record=True) as w:
-        sp = SoilProfile.from_location(x=0, y=0)
-    assert len(w) == 1
-    assert "No soil information available for this location: x = 0, y = 0." in str(
-        w[0].message
-    )
-    assert issubclass(w[0].category, UserWarning)
-    assert sp is None
-
-    # Test with location without soil profile: buildup area
-    with warnings.catch_warnings(record=True) as w:
-        sp = SoilProfile.from_location(x=185848.5, y=320060.5)
-    assert len(w) == 1
-    assert (
-        "No soil information available for this location: x = 185848.5, y = 320060.5."
-        in str(w[0].message)
-    )
-    assert issubclass(w[0].category, UserWarning)
-    assert sp is None
-
-    # Test with location without soil profile: digged area
-    with warnings.catch_warnings(record=True) as w:
-        sp = SoilProfile.from_location(x=183758.4, y=319317.1)
-    assert len(w) == 1
-    assert (
-        "No soil information available for this location: x = 183758.4, y = 319317.1."
-        in str(w[0].message)
-    )
-    assert issubclass(w[0].category, UserWarning)
-    assert sp is None
-
-    # Test with correct input: multiple locations
-    # Zuid-Limburg, Texel, Zeeland
-    x_test = [187859, 114373, 28193.4]
-    y_test = [321963, 567756, 375309.9]
+# Zuid-Limburg, Texel, Zeeland
+X_TEST = [187859, 114373, 28193.4]
+Y_TEST = [321963, 567756, 375309.9]
 
-    sps = SoilProfile.from_location(
-        x=x_test,
-        y=y_test,
-    )
-    assert [sp.index for sp in sps] == [5030, 90110186, 90115320]
 
-    # Test with one of the locations not having a soil profile
-    with warnings.catch_warnings(record=True) as w:
-        sp = SoilProfile.from_location(
-            x=x_test + [0],
-            y=y_test + [0],
+@pytest.fixture(scope="module")
+def location_batch():
+    """Soil profiles and warnings of one batch request for locations with and without soil information."""
+    # Groningen, Zuid-Limburg, Texel, Zeeland, no data, buildup area, digged area
+    with pytest.warns(UserWarning) as record:
+        sps = SoilProfile.from_location(
+            x=[200234, *X_TEST, 0, 185848.5, 183758.4],
+            y=[507675, *Y_TEST, 0, 320060.5, 319317.1],
         )
-    assert len(w) == 1
-    assert "No soil information available for this location: x = 0, y = 0." in str(
-        w[0].message
-    )
-    assert issubclass(w[0].category, UserWarning)
-    assert sp[-1] is None
+    return sps, [str(w.message) for w in record]
 
-    # Test with other forms of iterables
-    # np array
-    sps = SoilProfile.from_location(
-        x=array(x_test),
-        y=array(y_test),
-    )
-    assert [sp.index for sp in sps] == [5030, 90110186, 90115320]
 
-    # pd dataframe
-    df = DataFrame(index=x_test, data=y_test, columns=["y_test"])
-    sps = SoilProfile.from_location(
-        x=df.index,
-        y=df["y_test"],
-    )
-    assert [sp.index for sp in sps] == [5030, 90110186, 90115320]
+@pytest.mark.xdist_group(name="location")
+def test_from_location(location_batch):
+    # Test with correct input: multiple locations in one request
+    sps, _ = location_batch
+    assert [sp.index for sp in sps[:4]] == [1230, 5030, 90110186, 90115320]
 
-    # Test with incorrect input: X is list, Y not
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=x_test,
-            y=321963,
+    # Test with correct input: single location, other CRS (as string and as EPSG code)
+    for crs in ["EPSG:4326", 4326]:
+        sp = SoilProfile.from_location(
+            x=51.350794,
+            y=3.574202,
+            crs=crs,
         )
-    assert "X is iterable while Y is not." in str(exc_info.value)
+        assert sp.index == 90115320
 
-    # Test with incorrect input: Y is list, X not
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=187859,
-            y=y_test,
-        )
-    assert "Y is iterable while X is not." in str(exc_info.value)
 
-    # Test with incorrect input: X and Y do not have the same length
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=x_test[1:],
-            y=y_test,
-        )
-    assert (
-        "List of X and Y coordinates do not have the same length (x: 2, y: 3)."
-        in str(exc_info.value)
-    )
+@pytest.mark.xdist_group(name="location")
+def test_from_location_no_soil(location_batch):
+    # Test with location without soil profile: x=0,y=0
+    with pytest.warns(
+        UserWarning,
+        match=r"No soil information available for this location: x = 0, y = 0\.",
+    ):
+        sp = SoilProfile.from_location(x=0, y=0)
+    assert sp is None
 
-    # Test with incorrect input: X-coordinate in list is a string
-    xx = x_test + ["test"]
-    yy = y_test + [y_test[-1]]
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=xx,
-            y=yy,
-        )
-    assert "The 3th element of the X-coordinates is neither a float or int." in str(
-        exc_info.value
-    )
+    # Test with some of the locations not having a soil profile
+    # No data, buildup area, digged area
+    sps, messages = location_batch
+    assert messages == [
+        f"No soil information available for this location: x = {x}, y = {y}."
+        for x, y in [(0, 0), (185848.5, 320060.5), (183758.4, 319317.1)]
+    ]
+    assert sps[4:] == [None, None, None]
+
+
+@pytest.mark.xdist_group(name="location")
+@pytest.mark.parametrize(
+    "x, y",
+    [
+        (array(X_TEST), array(Y_TEST)),
+        (DataFrame(index=X_TEST).index, DataFrame(data={"y": Y_TEST})["y"]),
+    ],
+    ids=["numpy array", "pandas index and series"],
+)
+def test_from_location_iterables(x, y):
+    # Test with other forms of iterables
+    sps = SoilProfile.from_location(x=x, y=y)
+    assert [sp.index for sp in sps] == [5030, 90110186, 90115320]
 
-    # Test with incorrect input: Y-coordinate in list is a string
-    xx = x_test + [x_test[-1]]
-    yy = y_test + ["test"]
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=xx,
-            y=yy,
-        )
-    assert "The 3th element of the Y-coordinates is neither a float or int." in str(
-        exc_info.value
-    )
 
-    # Test with incorrect input: X-coordinate is a string
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x="test",
-            y=y_test[0],
-        )
-    assert "The X-coordinate 'test' is neither a float or int." in str(exc_info.value)
+@pytest.mark.parametrize(
+    "crs, expected",
+    [
+        (4326, "EPSG:4326"),
+        (int64(4326), "EPSG:4326"),
+        ("EPSG:4326", "EPSG:4326"),
+        ("CRS:84", "CRS:84"),
+        (True, True),
+    ],
+    ids=["int", "numpy int", "string", "other string", "bool"],
+)
+def test_format_crs(crs, expected):
+    # Test the normalisation of the CRS before it is sent to PDOK
+    assert SoilProfile._format_crs(crs) == expected
+
+
+def test_from_mapid():
+    # Test the offline part of from_location: map area id to soil profile
+    sp = SoilProfile._from_mapid("bodemkaart.26525")
+    assert sp.index == 1230
 
-    # Test with incorrect input: Y-coordinate is a string
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(
-            x=x_test[0],
-            y="test",
-        )
-    assert "The Y-coordinate 'test' is neither a float or int." in str(exc_info.value)
 
+@pytest.mark.parametrize(
+    "x, y, msg",
+    [
+        (X_TEST, 321963, "X is iterable while Y is not."),
+        (187859, Y_TEST, "Y is iterable while X is not."),
+        (
+            X_TEST[1:],
+            Y_TEST,
+            "List of X and Y coordinates do not have the same length (x: 2, y: 3).",
+        ),
+        (
+            [*X_TEST, "test"],
+            [*Y_TEST, Y_TEST[-1]],
+            "The 3th element of the X-coordinates is neither a float or int.",
+        ),
+        (
+            [*X_TEST, X_TEST[-1]],
+            [*Y_TEST, "test"],
+            "The 3th element of the Y-coordinates is neither a float or int.",
+        ),
+        ("test", Y_TEST[0], "The X-coordinate 'test' is neither a float or int."),
+        (X_TEST[0], "test", "The Y-coordinate 'test' is neither a float or int."),
+    ],
+    ids=[
+        "x iterable",
+        "y iterable",
+        "different length",
+        "x element string",
+        "y element string",
+        "x string",
+        "y string",
+    ],
+)
+def test_from_location_wrong_input(x, y, msg):
+    # Test with incorrect input, checked before any request is sent
+    with pytest.raises(ValueError, match=re.escape(msg)):
+        SoilProfile.from_location(x=x, y=y)
+
+
+@pytest.mark.xdist_group(name="location")
+def test_from_location_wrong_crs():
     # Test with non-existing CRS
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_location(x=x_test[0], y=y_test[0], crs="test")
-    assert "Unsupported CRS: test. Please use format 'EPSG:XXX'." in str(exc_info.value)
-
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Unsupported CRS: test. Please use format 'EPSG:XXX'."),
+    ):
+        SoilProfile.from_location(x=X_TEST[0], y=Y_TEST[0], crs="test")
 
-def test_get_area():
-    # Get soilprofile
-    sp = SoilProfile(bofekcluster=3015, bofekcluster_dominant=True)
 
+def test_get_area(sp3015):
     # Get area from profile
-    area = sp.get_area()
+    area = sp3015.get_area()
     assert area == 186782.5653
 
     # Get area from bofekcluster
-    area = sp.get_area(which="bofekcluster")
+    area = sp3015.get_area(which="bofekcluster")
     assert area == 335205.67601799994
 
     # Wrong input
-    with pytest.raises(ValueError) as exc_info:
-        SoilProfile.from_bofekcluster(3015).get_area(which="test")
-    assert (
-        "Value 'test' for variable 'which' is invalid. Please use 'profile' or 'bofekcluster'."
-        in str(exc_info.value)
-    )
-
-
-def test_get_data_horizons():
-    # Get soilprofile
-    sp = SoilProfile(bofekcluster=1008, bofekcluster_dominant=True)
-
-    # Test which=all
-    # Data to test
-    data_test = sp.get_data_horizons()
-    # Reference data
-    path = Path(__file__).parent / "data/soilprofile90110280_horizondata_all.csv"
-    data_ref = read_csv(path)
-    # Test
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "Value 'test' for variable 'which' is invalid. Please use 'profile' or 'bofekcluster'."
+        ),
+    ):
+        sp3015.get_area(which="test")
+
+
+@pytest.mark.xdist_group(name="bofek1008")
+@pytest.mark.parametrize("which", ["all", "hydraulic", "physical", "chemical"])
+def test_get_data_horizons(sp1008, which):
+    # Test data against its reference data
+    data_test = sp1008.get_data_horizons(which=which)
+    data_ref = read_reference(f"soilprofile90110280_horizondata_{which}.csv")
+    assert_frame_equal(data_test, data_ref, check_dtype=False)
+
+
+@pytest.mark.xdist_group(name="bofek1008")
+def test_get_data_horizons_repeated(sp1008):
+    # Test repeated call: modifying returned data does not change the next result
+    data_test = sp1008.get_data_horizons()
+    data_test.loc[:, "zbottom"] = 0.0
     assert_frame_equal(
-        data_test,
-        data_ref,
+        sp1008.get_data_horizons(),
+        read_reference("soilprofile90110280_horizondata_all.csv"),
         check_dtype=False,
     )
 
-    # Test which=hydraulic
-    # Data to test
-    data_test = sp.get_data_horizons(which="hydraulic")
-    # Reference data
-    path = Path(__file__).parent / "data/soilprofile90110280_horizondata_hydraulic.csv"
-    data_ref = read_csv(path)
-    # Test
-    assert_frame_equal(
-        data_test,
-        data_ref,
-        check_dtype=False,
-    )
 
-    # Test which=physical
-    # Data to test
-    data_test = sp.get_data_horizons(which="physical")
-    # Reference data
-    path = Path(__file__).parent / "data/soilprofile90110280_horizondata_physical.csv"
-    data_ref = read_csv(path)
-    # Test
-    assert_frame_equal(
-        data_test,
-        data_ref,
-        check_dtype=False,
-    )
+@pytest.mark.xdist_group(name="bofek1008")
+def test_get_data_horizons_arithmetic(sp1008):
+    # Test that integer data columns do not overflow in arithmetic
+    data_test = sp1008.get_data_horizons(which="physical")
+    data_ref = read_reference("soilprofile90110280_horizondata_physical.csv")
+    assert (data_test["sandmedian"] * 1000).tolist() == (
+        data_ref["sandmedian"] * 1000
+    ).tolist()
 
-    # Test which=chemical
-    # Data to test
-    data_test = sp.get_data_horizons(which="chemical")
-    # Reference data
-    path = Path(__file__).parent / "data/soilprofile90110280_horizondata_chemical.csv"
-    data_ref = read_csv(path)
-    # Test
-    assert_frame_equal(
-        data_test,
-        data_ref,
-        check_dtype=False,
-    )
 
+@pytest.mark.xdist_group(name="bofek1008")
+def test_get_data_horizons_wrong_input(sp1008):
     # Test which=wrong
-    with pytest.raises(ValueError) as exc_info:
-        sp.get_data_horizons(which="wrong")
-    assert (
-        "Unvalid value for 'which': wrong. Choose between 'all', 'hydraulic', 'physical', 'chemical'."
-        in str(exc_info.value)
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "Unvalid value for 'which': wrong. Choose between 'all', 'hydraulic', 'physical', 'chemical'."
+        ),
+    ):
+        sp1008.get_data_horizons(which="wrong")
+
+
+def test_read_csv_unknown_category(tmp_path):
+    # Copy a data file and add a row with an unknown Staring series block
+    path_ref = files("dutchsoils") / "data" / "Staringreeks2018.csv"
+    path = tmp_path / "Staringreeks2018.csv"
+    path.write_text(path_ref.read_text() + "119,0.0,0.4,0.02,1.5,0.5,10.0\n")
+
+    # Test that the unknown value is not silently turned into NaN
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "Unknown values [119] in column 'staringseriesblock' of Staringreeks2018.csv."
+        ),
+    ):
+        SoilProfile._read_csv_cached(path=path, skiprows=10)
+
+
+@pytest.mark.xdist_group(name="bofek1001")
+@pytest.mark.parametrize(
+    "depths, compheights, filename",
+    [
+        ([50, 30, 60, 60, 100], [1, 2, 5, 10, 20], "bofek1001_sp1.csv"),
+        ([10, 20, 80, 90, 100], [1, 2, 5, 10, 20], "bofek1001_sp2.csv"),
+    ],
+    ids=["aligned with soil layers", "not aligned with soil layers"],
+)
+def test_swapsoilprofile(sp1001, depths, compheights, filename):
+    # Get output to test
+    sp_test = sp1001.get_swapinput_profile(
+        discretisation_depths=depths,
+        discretisation_compheights=compheights,
     )
 
+    # Test if results are equal
+    assert_swapinput_equal(sp_test, read_reference(filename))
+
+
+@pytest.mark.xdist_group(name="bofek1001")
+def test_swapsoilprofile_wrong_input(sp1001):
+    # Test with incorrect input: depth is not a natural product of compartment height
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "The given compartment depths [31] are not a natural product of the given compartment heights [2]."
+        ),
+    ):
+        sp1001.get_swapinput_profile(
+            discretisation_depths=[50, 31],
+            discretisation_compheights=[1, 2],
+        )
 
-def test_swapsoilprofile():
-    # Get soil profile
-    sp = SoilProfile(bofekcluster=1001, bofekcluster_dominant=True)
-
-    # Test for discretisation that aligns well with soil physical layering
-    # Get correct dataframes
-    path = Path(__file__).parent / "data/bofek1001_sp1.csv"
-    sp_ref1 = read_csv(path)
 
-    # Get output to test
-    sp_test1 = DataFrame(
-        sp.get_swapinput_profile(
-            discretisation_depths=[50, 30, 60, 60, 100],
-            discretisation_compheights=[1, 2, 5, 10, 20],
+@pytest.mark.xdist_group(name="bofek1001")
+@pytest.mark.parametrize(
+    "depths, compheights",
+    [([50, 30], [1]), ([50], [1, 2]), ([], [])],
+    ids=["fewer heights", "fewer depths", "empty"],
+)
+def test_swapsoilprofile_wrong_length(sp1001, depths, compheights):
+    # Test with incorrect input: depths and compartment heights do not match
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "The given compartment depths and compartment heights should be non-empty and have the same length "
+            f"(depths: {len(depths)}, heights: {len(compheights)})."
+        ),
+    ):
+        sp1001.get_swapinput_profile(
+            discretisation_depths=depths,
+            discretisation_compheights=compheights,
         )
-    )
-
-    # Test if frames are equal
-    assert_frame_equal(
-        sp_ref1,
-        sp_test1,
-        check_dtype=False,
-    )
 
-    # Test for discretisation that aligns not with soil physical layering
-    # Get correct dataframes
-    path = Path(__file__).parent / "data/bofek1001_sp2.csv"
-    sp_ref2 = read_csv(path)
 
-    # Get output to test
-    sp_test2 = DataFrame(
-        sp.get_swapinput_profile(
-            discretisation_depths=[10, 20, 80, 90, 100],
-            discretisation_compheights=[1, 2, 5, 10, 20],
+@pytest.mark.xdist_group(name="bofek1001")
+@pytest.mark.parametrize(
+    "depths, compheights",
+    [([50], [0]), ([50, 30], [1, -2]), ([0, 30], [1, 2]), ([-50], [1])],
+    ids=["zero height", "negative height", "zero depth", "negative depth"],
+)
+def test_swapsoilprofile_not_positive(sp1001, depths, compheights):
+    # Test with incorrect input: depths or compartment heights are not positive
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            f"The given compartment depths {array(depths)} and compartment heights {array(compheights)} "
+            "should be positive."
+        ),
+    ):
+        sp1001.get_swapinput_profile(
+            discretisation_depths=depths,
+            discretisation_compheights=compheights,
         )
-    )
 
-    # Test if frames are equal
-    assert_frame_equal(
-        sp_ref2,
-        sp_test2,
-        check_dtype=False,
-    )
 
-
-def test_swaphydraulicparams():
+@pytest.mark.xdist_group(name="bofek1001")
+def test_swaphydraulicparams(sp1001):
     # Get correct dataframe
-    path = Path(__file__).parent / "data/bofek1001_hf.csv"
-    hf_ref = read_csv(path)
-
-    # Get soil profile
-    sp = SoilProfile(bofekcluster=1001, bofekcluster_dominant=True)
+    hf_ref = read_reference("bofek1001_hf.csv")
 
     # Get output to test
-    hf_test = DataFrame(sp.get_swapinput_hydraulicparams())
+    hf_test = sp1001.get_swapinput_hydraulicparams()
 
-    # Test if frames are equal
-    assert_frame_equal(
-        hf_ref,
-        hf_test,
-        check_dtype=False,
+    # Test if results are equal
+    assert_swapinput_equal(hf_test, hf_ref)
+
+
+@pytest.mark.xdist_group(name="bofek1001")
+def test_swapinput_repeated(sp1001):
+    # Test repeated call: modifying returned arrays does not change the next result
+    for key, values in sp1001.get_swapinput_hydraulicparams().items():
+        if key != "H_ENPR":
+            values[:] = -1
+    for values in sp1001.get_swapinput_fractions().values():
+        values[:] = -1
+
+    # Query again through a new instance of the same soil profile
+    sp = SoilProfile(index=sp1001.index)
+    assert_swapinput_equal(
+        sp.get_swapinput_hydraulicparams(), read_reference("bofek1001_hf.csv")
+    )
+    assert_swapinput_equal(
+        sp.get_swapinput_fractions(), read_reference("bofek1001_frac.csv")
     )
 
 
-def test_swapfractions():
+@pytest.mark.xdist_group(name="bofek1001")
+def test_swapfractions(sp1001):
     # Get correct dataframe
-    path = Path(__file__).parent / "data/bofek1001_frac.csv"
-    frac_ref = read_csv(path)
-
-    # Get soil profile
-    sp = SoilProfile(bofekcluster=1001, bofekcluster_dominant=True)
+    frac_ref = read_reference("bofek1001_frac.csv")
 
     # Get output to test
-    frac_test = DataFrame(sp.get_swapinput_fractions())
+    frac_test = sp1001.get_swapinput_fractions()
 
-    # Test if frames are equal
-    assert_frame_equal(
-        frac_ref,
-        frac_test,
-        check_dtype=False,
-    )
+    # Test if results are equal
+    assert_swapinput_equal(frac_test, frac_ref)
 
 
-def test_swapcofani():
+@pytest.mark.xdist_group(name="bofek1001")
+def test_swapcofani(sp1001):
     # Get correct result
     cof_ref = [1.0, 1.0, 1.0, 1.0]
 
-    # Get soil profile
-    sp = SoilProfile(bofekcluster=1001, bofekcluster_dominant=True)
-
     # Get output to test
-    cof_test = sp.get_swapinput_cofani()
+    cof_test = sp1001.get_swapinput_cofani()
 
-    # Test if frames are equal
-    assert cof_ref == cof_test
+    # Test if results are equal
+    assert_array_equal(asarray(cof_test), cof_ref)
 
 
-def test_plot():
-    SoilProfile(bofekcluster=1008, bofekcluster_dominant=True).plot()
+@pytest.mark.slow
+@pytest.mark.xdist_group(name="bofek1008")
+def test_plot(sp1008):
+    fig = sp1008.plot()
+    assert len(fig.axes) > 0
+    plt.close(fig)